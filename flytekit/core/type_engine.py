@@ -796,6 +796,7 @@ class TypeEngine(typing.Generic[T]):
         from flytekit.types.structured import (
             register_arrow_handlers,
             register_bigquery_handlers,
+            register_flight_handlers,
             register_pandas_handlers,
         )
 
@@ -815,6 +816,8 @@ class TypeEngine(typing.Generic[T]):
             register_arrow_handlers()
         if is_imported("google.cloud.bigquery"):
             register_bigquery_handlers()
+        if is_imported("pyarrow.flight"):
+            register_flight_handlers()
         if is_imported("numpy"):
             from flytekit.types import numpy  # noqa: F401
 
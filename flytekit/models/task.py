@@ -16,6 +16,20 @@ from flytekit.models.core import identifier as _identifier
 from flytekit.models.documentation import Documentation
 
 
+def _custom_to_struct(custom: typing.Dict[str, typing.Any]) -> _struct.Struct:
+    """
+    Converts the custom of a task template to a protobuf Struct. Struct.update builds the Struct straight from the
+    python values, instead of dumping them to json and parsing that back through the reflection based json_format.
+    Dictionaries that Struct can't take as is, e.g. with non-string keys, still go through json, which coerces them.
+    """
+    struct = _struct.Struct()
+    try:
+        struct.update(custom)
+    except (TypeError, ValueError):
+        struct = _json_format.Parse(_json.dumps(custom), _struct.Struct())
+    return struct
+
+
 class Resources(_common.FlyteIdlEntity):
     class ResourceName(object):
         UNKNOWN = _core_task.Resources.UNKNOWN
@@ -460,7 +474,7 @@ class TaskTemplate(_common.FlyteIdlEntity):
             type=self.type,
             metadata=self.metadata.to_flyte_idl(),
             interface=self.interface.to_flyte_idl(),
-            custom=_json_format.Parse(_json.dumps(self.custom), _struct.Struct()) if self.custom else None,
+            custom=_custom_to_struct(self.custom) if self.custom else None,
             container=self.container.to_flyte_idl() if self.container else None,
             task_type_version=self.task_type_version,
             security_context=self.security_context.to_flyte_idl() if self.security_context else None,
@@ -35,20 +35,34 @@ def register_csv_handlers():
 def register_pandas_handlers():
     import pandas as pd
 
-    from .basic_dfs import PandasToParquetEncodingHandler, ParquetToPandasDecodingHandler
+    from .basic_dfs import (
+        ArrowIPCToPandasDecodingHandler,
+        PandasToArrowIPCEncodingHandler,
+        PandasToParquetEncodingHandler,
+        ParquetToPandasDecodingHandler,
+    )
 
     StructuredDatasetTransformerEngine.register(PandasToParquetEncodingHandler(), default_format_for_type=True)
     StructuredDatasetTransformerEngine.register(ParquetToPandasDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(PandasToArrowIPCEncodingHandler())
+    StructuredDatasetTransformerEngine.register(ArrowIPCToPandasDecodingHandler())
     StructuredDatasetTransformerEngine.register_renderer(pd.DataFrame, TopFrameRenderer())
 
 
 def register_arrow_handlers():
     import pyarrow as pa
 
-    from .basic_dfs import ArrowToParquetEncodingHandler, ParquetToArrowDecodingHandler
+    from .basic_dfs import (
+        ArrowIPCToArrowDecodingHandler,
+        ArrowToArrowIPCEncodingHandler,
+        ArrowToParquetEncodingHandler,
+        ParquetToArrowDecodingHandler,
+    )
 
     StructuredDatasetTransformerEngine.register(ArrowToParquetEncodingHandler(), default_format_for_type=True)
     StructuredDatasetTransformerEngine.register(ParquetToArrowDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(ArrowToArrowIPCEncodingHandler())
+    StructuredDatasetTransformerEngine.register(ArrowIPCToArrowDecodingHandler())
     StructuredDatasetTransformerEngine.register_renderer(pa.Table, ArrowRenderer())
 
 
@@ -70,3 +84,23 @@ def register_bigquery_handlers():
             "We won't register bigquery handler for structured dataset because "
             "we can't find the packages google-cloud-bigquery-storage and google-cloud-bigquery"
         )
+
+
+def register_flight_handlers():
+    try:
+        from .flight import (
+            ArrowToFlightEncodingHandler,
+            FlightToArrowDecodingHandler,
+            FlightToPandasDecodingHandler,
+            PandasToFlightEncodingHandler,
+        )
+
+        StructuredDatasetTransformerEngine.register(PandasToFlightEncodingHandler())
+        StructuredDatasetTransformerEngine.register(FlightToPandasDecodingHandler())
+        StructuredDatasetTransformerEngine.register(ArrowToFlightEncodingHandler())
+        StructuredDatasetTransformerEngine.register(FlightToArrowDecodingHandler())
+    except ImportError:
+        logger.info(
+            "We won't register the arrow flight handlers for structured dataset because "
+            "pyarrow was built without flight support"
+        )
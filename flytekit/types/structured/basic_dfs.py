@@ -5,6 +5,7 @@ from typing import TypeVar
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 from botocore.exceptions import NoCredentialsError
 from fsspec.core import split_protocol, strip_protocol
@@ -17,6 +18,7 @@ from flytekit.models import literals
 from flytekit.models.literals import StructuredDatasetMetadata
 from flytekit.models.types import StructuredDatasetType
 from flytekit.types.structured.structured_dataset import (
+    ARROW,
     CSV,
     PARQUET,
     StructuredDataset,
@@ -26,6 +28,9 @@ from flytekit.types.structured.structured_dataset import (
 
 T = TypeVar("T")
 
+# Number of rows per dataframe yielded when iterating over a parquet dataset
+PARQUET_BATCH_SIZE = 10_000
+
 
 def get_storage_options(cfg: DataConfig, uri: str, anon: bool = False) -> typing.Optional[typing.Dict]:
     protocol = get_protocol(uri)
@@ -36,6 +41,138 @@ def get_storage_options(cfg: DataConfig, uri: str, anon: bool = False) -> typing
     return None
 
 
+def _is_floating_arrow_type(t: pa.DataType) -> bool:
+    if pa.types.is_list(t) or pa.types.is_large_list(t) or pa.types.is_fixed_size_list(t):
+        return _is_floating_arrow_type(t.value_type)
+    return pa.types.is_floating(t)
+
+
+def use_dictionary_encoding(table: pa.Table) -> typing.Union[bool, typing.List[str]]:
+    """
+    Returns the ``use_dictionary`` argument to pass to the parquet writer. Dictionary encoding pays off for low
+    cardinality columns such as strings, categoricals or integer codes, but floating point data (e.g. wide float frames
+    or embedding vectors) is nearly always high cardinality, so parquet builds a dictionary for every column chunk only
+    to fall back to plain encoding. Floating point columns are therefore left out of the list of dictionary encoded
+    columns, and ``True`` is returned when there are none.
+    """
+    schema = table.schema
+    floating = {f.name for f in schema if _is_floating_arrow_type(f.type)}
+    if not floating:
+        return True
+    # The writer matches the list against leaf column paths, which differ from the field names for nested types.
+    # Keep the writer default rather than disable the dictionary for the leaves of other nested columns.
+    if any(pa.types.is_nested(f.type) for f in schema if f.name not in floating):
+        return True
+    return [f.name for f in schema if f.name not in floating]
+
+
+def read_parquet_table(
+    ctx: FlyteContext,
+    uri: str,
+    columns: typing.Optional[typing.List[str]],
+    use_pandas_metadata: bool = False,
+) -> pa.Table:
+    """
+    Reads the parquet file(s) at the given uri into an arrow table. Only the requested columns are read, thanks to
+    the columnar layout of parquet the other ones are never fetched. Set ``use_pandas_metadata`` when the table is
+    converted to pandas afterwards, so that the index columns are read along with the requested ones.
+    """
+    _, path = split_protocol(uri)
+    try:
+        fs = ctx.file_access.get_filesystem_for_path(uri)
+        return pq.read_table(path, filesystem=fs, columns=columns, use_pandas_metadata=use_pandas_metadata)
+    except NoCredentialsError as e:
+        logger.debug("S3 source detected, attempting anonymous S3 access")
+        fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=True)
+        if fs is not None:
+            return pq.read_table(path, filesystem=fs, columns=columns, use_pandas_metadata=use_pandas_metadata)
+        raise e
+
+
+def _with_pandas_index_columns(columns: typing.List[str], schema: pa.Schema) -> typing.List[str]:
+    """
+    Adds the columns holding the pandas index, if any, to the requested ones. Range indexes are stored as metadata
+    only, the other ones as columns named in the pandas metadata's index_columns.
+    """
+    index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+    return columns + [c for c in index_columns if isinstance(c, str) and c not in columns]
+
+
+def iter_parquet_batches(
+    ctx: FlyteContext,
+    uri: str,
+    columns: typing.Optional[typing.List[str]],
+    use_pandas_metadata: bool = False,
+) -> typing.Iterator[pa.RecordBatch]:
+    """
+    Lazily reads the parquet file(s) at the given uri, one record batch of at most ``PARQUET_BATCH_SIZE`` rows at a
+    time, only materializing the requested columns. As for ``read_parquet_table``, set ``use_pandas_metadata`` to
+    keep the index columns along with the requested ones.
+    """
+    _, path = split_protocol(uri)
+
+    def to_batches(fs) -> typing.Iterator[pa.RecordBatch]:
+        dataset = ds.dataset(path, filesystem=fs, format="parquet")
+        cols = _with_pandas_index_columns(columns, dataset.schema) if columns and use_pandas_metadata else columns
+        return dataset.to_batches(columns=cols, batch_size=PARQUET_BATCH_SIZE)
+
+    # The files are only opened once iteration starts, so credential errors can surface while reading batches too.
+    started = False
+    try:
+        for batch in to_batches(ctx.file_access.get_filesystem_for_path(uri)):
+            started = True
+            yield batch
+    except NoCredentialsError as e:
+        # Retrying after some batches went out would yield them twice
+        if started:
+            raise e
+        logger.debug("S3 source detected, attempting anonymous S3 access")
+        fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=True)
+        if fs is None:
+            raise e
+        yield from to_batches(fs)
+
+
+def write_arrow_ipc(ctx: FlyteContext, table: pa.Table, uri: str):
+    """
+    Writes the table to the given uri in the Arrow IPC file format (a.k.a. Feather v2). Unlike parquet, this is the
+    in-memory layout of arrow, so there is no encoding or compression to do.
+    """
+    if not ctx.file_access.is_remote(uri):
+        Path(uri).mkdir(parents=True, exist_ok=True)
+    path = os.path.join(uri, f"{0:05}")
+    if not ctx.file_access.is_remote(path):
+        sink = pa.OSFile(strip_protocol(path), "wb")
+    else:
+        sink = ctx.file_access.get_filesystem_for_path(path).open(path, "wb")
+    with sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_arrow_ipc(
+    ctx: FlyteContext,
+    uri: str,
+    columns: typing.Optional[typing.List[str]],
+    use_pandas_metadata: bool = False,
+) -> pa.Table:
+    """
+    Reads an Arrow IPC file written by ``write_arrow_ipc``. Local files are memory mapped, so the returned table
+    points into the page cache instead of being copied into memory. As for ``read_parquet_table``, set
+    ``use_pandas_metadata`` to keep the index columns along with the requested ones.
+    """
+    path = os.path.join(uri, f"{0:05}")
+    if not ctx.file_access.is_remote(path):
+        # The buffers of the table keep the memory map alive, so it is not closed here.
+        table = pa.ipc.open_file(pa.memory_map(strip_protocol(path), "r")).read_all()
+    else:
+        with ctx.file_access.get_filesystem_for_path(path).open(path, "rb") as source:
+            table = pa.ipc.open_file(source).read_all()
+    if columns:
+        table = table.select(_with_pandas_index_columns(columns, table.schema) if use_pandas_metadata else columns)
+    return table
+
+
 class PandasToCSVEncodingHandler(StructuredDatasetEncoder):
     def __init__(self):
         super().__init__(pd.DataFrame, None, CSV)
@@ -99,11 +236,16 @@ class PandasToParquetEncodingHandler(StructuredDatasetEncoder):
             Path(uri).mkdir(parents=True, exist_ok=True)
         path = os.path.join(uri, f"{0:05}")
         df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
-        df.to_parquet(
-            path,
+        # This is what to_parquet does under the hood. Converting to arrow here lets the dictionary encoding be picked
+        # from the exact columns that get written, without converting the dataframe a second time.
+        table = pa.Table.from_pandas(df)
+        pq.write_table(
+            table,
+            strip_protocol(path),
+            filesystem=ctx.file_access.get_filesystem_for_path(path),
             coerce_timestamps="us",
             allow_truncated_timestamps=False,
-            storage_options=get_storage_options(ctx.file_access.data_config, path),
+            use_dictionary=use_dictionary_encoding(table),
         )
         structured_dataset_type.format = PARQUET
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
@@ -119,17 +261,25 @@ class ParquetToPandasDecodingHandler(StructuredDatasetDecoder):
         flyte_value: literals.StructuredDataset,
         current_task_metadata: StructuredDatasetMetadata,
     ) -> pd.DataFrame:
-        uri = flyte_value.uri
         columns = None
-        kwargs = get_storage_options(ctx.file_access.data_config, uri)
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
-        try:
-            return pd.read_parquet(uri, columns=columns, storage_options=kwargs)
-        except NoCredentialsError:
-            logger.debug("S3 source detected, attempting anonymous S3 access")
-            kwargs = get_storage_options(ctx.file_access.data_config, uri, anon=True)
-            return pd.read_parquet(uri, columns=columns, storage_options=kwargs)
+        table = read_parquet_table(ctx, flyte_value.uri, columns, use_pandas_metadata=True)
+        # The table is dropped right after the conversion, so let arrow release each column's buffers as soon as
+        # it has been converted instead of holding both copies of the data until the end.
+        return table.to_pandas(self_destruct=True)
+
+    def decode_batches(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> typing.Iterator[pd.DataFrame]:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        for batch in iter_parquet_batches(ctx, flyte_value.uri, columns, use_pandas_metadata=True):
+            yield batch.to_pandas()
 
 
 class ArrowToParquetEncodingHandler(StructuredDatasetEncoder):
@@ -147,7 +297,10 @@ class ArrowToParquetEncodingHandler(StructuredDatasetEncoder):
             Path(uri).mkdir(parents=True, exist_ok=True)
         path = os.path.join(uri, f"{0:05}")
         filesystem = ctx.file_access.get_filesystem_for_path(path)
-        pq.write_table(structured_dataset.dataframe, strip_protocol(path), filesystem=filesystem)
+        table = typing.cast(pa.Table, structured_dataset.dataframe)
+        pq.write_table(
+            table, strip_protocol(path), filesystem=filesystem, use_dictionary=use_dictionary_encoding(table)
+        )
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
 
 
@@ -164,17 +317,85 @@ class ParquetToArrowDecodingHandler(StructuredDatasetDecoder):
         uri = flyte_value.uri
         if not ctx.file_access.is_remote(uri):
             Path(uri).parent.mkdir(parents=True, exist_ok=True)
-        _, path = split_protocol(uri)
 
         columns = None
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
-        try:
-            fs = ctx.file_access.get_filesystem_for_path(uri)
-            return pq.read_table(path, filesystem=fs, columns=columns)
-        except NoCredentialsError as e:
-            logger.debug("S3 source detected, attempting anonymous S3 access")
-            fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=True)
-            if fs is not None:
-                return pq.read_table(path, filesystem=fs, columns=columns)
-            raise e
+        return read_parquet_table(ctx, uri, columns)
+
+    def decode_batches(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> typing.Iterator[pa.Table]:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        for batch in iter_parquet_batches(ctx, flyte_value.uri, columns):
+            yield pa.Table.from_batches([batch])
+
+
+class ArrowToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pa.Table, None, ARROW)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        uri = typing.cast(str, structured_dataset.uri) or ctx.file_access.get_random_remote_directory()
+        write_arrow_ipc(ctx, typing.cast(pa.Table, structured_dataset.dataframe), uri)
+        structured_dataset_type.format = ARROW
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToArrowDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pa.Table, None, ARROW)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pa.Table:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        return read_arrow_ipc(ctx, flyte_value.uri, columns)
+
+
+class PandasToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, None, ARROW)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        uri = typing.cast(str, structured_dataset.uri) or ctx.file_access.get_random_remote_directory()
+        df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
+        write_arrow_ipc(ctx, pa.Table.from_pandas(df), uri)
+        structured_dataset_type.format = ARROW
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToPandasDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, None, ARROW)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pd.DataFrame:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        return read_arrow_ipc(ctx, flyte_value.uri, columns, use_pandas_metadata=True).to_pandas()
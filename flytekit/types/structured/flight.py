@@ -0,0 +1,146 @@
+import typing
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.flight as flight
+
+from flytekit import FlyteContext, logger
+from flytekit.models import literals
+from flytekit.models.types import StructuredDatasetType
+from flytekit.types.structured.structured_dataset import (
+    StructuredDataset,
+    StructuredDatasetDecoder,
+    StructuredDatasetEncoder,
+    StructuredDatasetMetadata,
+)
+
+FLIGHT = "grpc"
+# Endpoint location telling the client to read from the service it got the flight info from
+_REUSE_CONNECTION = "arrow-flight-reuse-connection:"
+
+
+def _split_flight_uri(uri: str) -> typing.Tuple[str, str]:
+    """
+    Splits ``grpc://host:port/some/path`` into the location of the Flight service, ``grpc://host:port``, and the
+    path of the dataset on it, ``some/path``.
+    """
+    protocol, rest = uri.split("://", 1)
+    netloc, _, path = rest.partition("/")
+    if not path:
+        raise ValueError(f"Flight uri {uri} should be of the form {FLIGHT}://host:port/path")
+    return f"{protocol}://{netloc}", path
+
+
+def _write_to_flight(structured_dataset: StructuredDataset, table: pa.Table):
+    location, path = _split_flight_uri(typing.cast(str, structured_dataset.uri))
+    client = flight.FlightClient(location)
+    try:
+        writer, _ = client.do_put(flight.FlightDescriptor.for_path(path), table.schema)
+        writer.write_table(table)
+        writer.close()
+    finally:
+        client.close()
+
+
+def _read_endpoint(
+    endpoint: flight.FlightEndpoint, location: str, clients: typing.Dict[str, flight.FlightClient]
+) -> pa.Table:
+    """
+    Fetches the data behind a Flight endpoint. A multi-node Flight service may serve it from other nodes than the
+    one the dataset was requested from, in which case it can be read from any of the endpoint locations. Endpoints
+    without locations are served by the service the dataset was requested from.
+    """
+    locations = []
+    for loc in endpoint.locations:
+        uri = loc.uri.decode() if isinstance(loc.uri, bytes) else loc.uri
+        locations.append(location if uri.startswith(_REUSE_CONNECTION) else uri)
+
+    def do_get(uri: str) -> pa.Table:
+        if uri not in clients:
+            clients[uri] = flight.FlightClient(uri)
+        return clients[uri].do_get(endpoint.ticket).read_all()
+
+    for uri in locations[:-1]:
+        try:
+            return do_get(uri)
+        except flight.FlightError as e:
+            logger.debug(f"Failed to read Flight endpoint from {uri}, trying the next location: {e}")
+    return do_get(locations[-1] if locations else location)
+
+
+def _read_from_flight(
+    flyte_value: literals.StructuredDataset, current_task_metadata: StructuredDatasetMetadata
+) -> pa.Table:
+    location, path = _split_flight_uri(flyte_value.uri)
+    clients = {location: flight.FlightClient(location)}
+    try:
+        info = clients[location].get_flight_info(flight.FlightDescriptor.for_path(path))
+        # The data is streamed straight into arrow record batches, there is no file format to decode.
+        tables = [_read_endpoint(endpoint, location, clients) for endpoint in info.endpoints]
+    finally:
+        for client in clients.values():
+            client.close()
+
+    table = pa.concat_tables(tables) if tables else info.schema.empty_table()
+    if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+        table = table.select([c.name for c in current_task_metadata.structured_dataset_type.columns])
+    return table
+
+
+class PandasToFlightEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, FLIGHT, supported_format="")
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
+        _write_to_flight(structured_dataset, pa.Table.from_pandas(df))
+        return literals.StructuredDataset(
+            uri=typing.cast(str, structured_dataset.uri), metadata=StructuredDatasetMetadata(structured_dataset_type)
+        )
+
+
+class FlightToPandasDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, FLIGHT, supported_format="")
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pd.DataFrame:
+        return _read_from_flight(flyte_value, current_task_metadata).to_pandas()
+
+
+class ArrowToFlightEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pa.Table, FLIGHT, supported_format="")
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        _write_to_flight(structured_dataset, typing.cast(pa.Table, structured_dataset.dataframe))
+        return literals.StructuredDataset(
+            uri=typing.cast(str, structured_dataset.uri), metadata=StructuredDatasetMetadata(structured_dataset_type)
+        )
+
+
+class FlightToArrowDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pa.Table, FLIGHT, supported_format="")
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pa.Table:
+        return _read_from_flight(flyte_value, current_task_metadata)
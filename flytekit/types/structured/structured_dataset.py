@@ -5,11 +5,10 @@ import types
 import typing
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, Generator, Optional, Type, Union
+from typing import Dict, Generator, Optional, Tuple, Type, Union
 
 import _datetime
 from dataclasses_json import config, dataclass_json
-from fsspec.utils import get_protocol
 from marshmallow import fields
 from typing_extensions import Annotated, TypeAlias, get_args, get_origin
 
@@ -39,10 +38,23 @@ StructuredDatasetFormat: TypeAlias = str
 # Storage formats
 PARQUET: StructuredDatasetFormat = "parquet"
 CSV: StructuredDatasetFormat = "csv"
+ARROW: StructuredDatasetFormat = "arrow"
 GENERIC_FORMAT: StructuredDatasetFormat = ""
 GENERIC_PROTOCOL: str = "generic protocol"
 
 
+def _get_protocol(uri: str) -> str:
+    """
+    Same as ``fsspec.utils.get_protocol``, i.e. the part before the first ``://`` or ``::`` and ``file`` if there is
+    neither, but without splitting the whole uri with a regex. This runs for every literal conversion.
+    """
+    sep = uri.find("://")
+    chained = uri.find("::")
+    if chained != -1 and (sep == -1 or chained < sep):
+        sep = chained
+    return uri[:sep] if sep != -1 else "file"
+
+
 @dataclass_json
 @dataclass
 class StructuredDataset(object):
@@ -60,7 +72,7 @@ class StructuredDataset(object):
 
     @classmethod
     def column_names(cls) -> typing.List[str]:
-        return [k for k, v in cls.columns().items()]
+        return list(cls.columns())
 
     def __init__(
         self,
@@ -277,6 +289,29 @@ class StructuredDatasetDecoder(ABC):
         """
         raise NotImplementedError
 
+    def decode_batches(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> typing.Iterator[DF]:
+        """
+        This is called by the dataset transformer engine when the dataset is iterated over, e.g.
+        ``sd.open(pd.DataFrame).iter()``. Decoders that are able to read the data in chunks should override this
+        to yield the dataframes lazily, so that the whole dataset never has to fit in memory. By default, this
+        relies on ``decode`` returning an iterator.
+
+        :param ctx: A FlyteContext, useful in accessing the filesystem and other attributes
+        :param flyte_value: This will be a Flyte IDL StructuredDataset Literal
+        :param current_task_metadata: Metadata object containing the type (and columns if any) for the currently
+         executing task.
+        :return: An iterator of dataframes that this decoder handles.
+        """
+        result: Union[DF, typing.Iterator[DF]] = self.decode(ctx, flyte_value, current_task_metadata)
+        if not isinstance(result, types.GeneratorType):
+            raise ValueError(f"Decoder {self} didn't return iterator {result} but should have from {flyte_value}")
+        return result
+
 
 def convert_schema_type_to_structured_dataset_type(
     column_type: int,
@@ -334,8 +369,9 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     registering with the main type engine, you should register with this transformer instead.
     """
 
-    ENCODERS: Dict[Type, Dict[str, Dict[str, StructuredDatasetEncoder]]] = {}
-    DECODERS: Dict[Type, Dict[str, Dict[str, StructuredDatasetDecoder]]] = {}
+    # Handlers are keyed by (dataframe type, protocol, format)
+    ENCODERS: Dict[Tuple[Type, str, str], StructuredDatasetEncoder] = {}
+    DECODERS: Dict[Tuple[Type, str, str], StructuredDatasetDecoder] = {}
     DEFAULT_PROTOCOLS: Dict[Type, str] = {}
     DEFAULT_FORMATS: Dict[Type, str] = {}
 
@@ -345,53 +381,36 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     @classmethod
     def _finder(cls, handler_map, df_type: Type, protocol: str, format: str):
         # If there's an exact match, then we should use it.
-        try:
-            return handler_map[df_type][protocol][format]
-        except KeyError:
-            ...
-
-        fsspec_handler = None
-        protocol_specific_handler = None
-        single_handler = None
+        handler = handler_map.get((df_type, protocol, format))
+        if handler is not None:
+            return handler
+
         default_format = cls.DEFAULT_FORMATS.get(df_type, None)
 
-        try:
-            fss_handlers = handler_map[df_type]["fsspec"]
-            if format in fss_handlers:
-                fsspec_handler = fss_handlers[format]
-            elif GENERIC_FORMAT in fss_handlers:
-                fsspec_handler = fss_handlers[GENERIC_FORMAT]
-            else:
-                if default_format and default_format in fss_handlers and format == GENERIC_FORMAT:
-                    fsspec_handler = fss_handlers[default_format]
-                else:
-                    if len(fss_handlers) == 1 and format == GENERIC_FORMAT:
-                        single_handler = list(fss_handlers.values())[0]
-                    else:
-                        ...
-        except KeyError:
-            ...
-
-        try:
-            protocol_handlers = handler_map[df_type][protocol]
-            if GENERIC_FORMAT in protocol_handlers:
-                protocol_specific_handler = protocol_handlers[GENERIC_FORMAT]
-            else:
-                if default_format and default_format in protocol_handlers:
-                    protocol_specific_handler = protocol_handlers[default_format]
-                else:
-                    if len(protocol_handlers) == 1:
-                        single_handler = list(protocol_handlers.values())[0]
-                    else:
-                        ...
-
-        except KeyError:
-            ...
-
-        if protocol_specific_handler or fsspec_handler or single_handler:
-            return protocol_specific_handler or fsspec_handler or single_handler
-        else:
-            raise ValueError(f"Failed to find a handler for {df_type}, protocol [{protocol}], fmt ['{format}']")
+        # Next, a handler specific to this protocol that handles any format, or the default format of the type.
+        handler = handler_map.get((df_type, protocol, GENERIC_FORMAT))
+        if handler is None and default_format:
+            handler = handler_map.get((df_type, protocol, default_format))
+        if handler is not None:
+            return handler
+
+        # Then the handlers registered for all the protocols that the data persistence layer can handle.
+        handler = handler_map.get((df_type, "fsspec", format)) or handler_map.get((df_type, "fsspec", GENERIC_FORMAT))
+        if handler is None and default_format and format == GENERIC_FORMAT:
+            handler = handler_map.get((df_type, "fsspec", default_format))
+        if handler is not None:
+            return handler
+
+        # Lastly, if there's only one handler for the protocol (or for fsspec if no format was asked for), use that.
+        protocol_handlers = [h for (t, p, _), h in handler_map.items() if t == df_type and p == protocol]
+        if len(protocol_handlers) == 1:
+            return protocol_handlers[0]
+        if format == GENERIC_FORMAT:
+            fsspec_handlers = [h for (t, p, _), h in handler_map.items() if t == df_type and p == "fsspec"]
+            if len(fsspec_handlers) == 1:
+                return fsspec_handlers[0]
+
+        raise ValueError(f"Failed to find a handler for {df_type}, protocol [{protocol}], fmt ['{format}']")
 
     @classmethod
     def get_encoder(cls, df_type: Type, protocol: str, format: str):
@@ -402,18 +421,13 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         return cls._finder(StructuredDatasetTransformerEngine.DECODERS, df_type, protocol, format)
 
     @classmethod
-    def _handler_finder(cls, h: Handlers, protocol: str) -> Dict[str, Handlers]:
+    def _handler_finder(cls, h: Handlers) -> Dict[Tuple[Type, str, str], Handlers]:
         if isinstance(h, StructuredDatasetEncoder):
-            top_level = cls.ENCODERS
+            return cls.ENCODERS  # type: ignore
         elif isinstance(h, StructuredDatasetDecoder):
-            top_level = cls.DECODERS  # type: ignore
+            return cls.DECODERS  # type: ignore
         else:
             raise TypeError(f"We don't support this type of handler {h}")
-        if h.python_type not in top_level:
-            top_level[h.python_type] = {}
-        if protocol not in top_level[h.python_type]:
-            top_level[h.python_type][protocol] = {}
-        return top_level[h.python_type][protocol]  # type: ignore
 
     def __init__(self):
         super().__init__("StructuredDataset Transformer", StructuredDataset)
@@ -485,12 +499,11 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         """
         if protocol == "/":
             protocol = "file"
-        lowest_level = cls._handler_finder(h, protocol)
-        if h.supported_format in lowest_level and override is False:
-            raise DuplicateHandlerError(
-                f"Already registered a handler for {(h.python_type, protocol, h.supported_format)}"
-            )
-        lowest_level[h.supported_format] = h
+        handler_map = cls._handler_finder(h)
+        key = (h.python_type, protocol, h.supported_format)
+        if key in handler_map and override is False:
+            raise DuplicateHandlerError(f"Already registered a handler for {key}")
+        handler_map[key] = h
         logger.debug(f"Registered {h} as handler for {h.python_type}, protocol {protocol}, fmt {h.supported_format}")
 
         if (default_format_for_type or default_for_type) and h.supported_format != GENERIC_FORMAT:
@@ -532,8 +545,9 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         # Make a copy in case we need to hand off to encoders, since we can't be sure of mutations.
         # Check first to see if it's even an SD type. For backwards compatibility, we may be getting a FlyteSchema
         python_type, *attrs = extract_cols_and_format(python_type)
+        default_format = self.DEFAULT_FORMATS.get(python_type, GENERIC_FORMAT)
         # In case it's a FlyteSchema
-        sdt = StructuredDatasetType(format=self.DEFAULT_FORMATS.get(python_type, GENERIC_FORMAT))
+        sdt = StructuredDatasetType(format=default_format)
 
         if expected and expected.structured_dataset_type:
             sdt = StructuredDatasetType(
@@ -593,22 +607,23 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
             )
 
         # Otherwise assume it's a dataframe instance. Wrap it with some defaults
-        fmt = self.DEFAULT_FORMATS.get(python_type, "")
         protocol = self._protocol_from_type_or_prefix(ctx, python_type)
         meta = StructuredDatasetMetadata(structured_dataset_type=expected.structured_dataset_type if expected else None)
 
         sd = StructuredDataset(dataframe=python_val, metadata=meta)
-        return self.encode(ctx, sd, python_type, protocol, fmt, sdt)
+        # Like case 3 above, honor a format given in the annotation, e.g. Annotated[pd.DataFrame, "arrow"]
+        return self.encode(ctx, sd, python_type, protocol, sdt.format or default_format, sdt)
 
     def _protocol_from_type_or_prefix(self, ctx: FlyteContext, df_type: Type, uri: Optional[str] = None) -> str:
         """
         Get the protocol from the default, if missing, then look it up from the uri if provided, if not then look
         up from the provided context's file access.
         """
-        if df_type in self.DEFAULT_PROTOCOLS:
-            return self.DEFAULT_PROTOCOLS[df_type]
+        protocol = self.DEFAULT_PROTOCOLS.get(df_type)
+        if protocol is not None:
+            return protocol
         else:
-            protocol = get_protocol(uri or ctx.file_access.raw_output_prefix)
+            protocol = _get_protocol(uri or ctx.file_access.raw_output_prefix)
             logger.debug(
                 f"No default protocol for type {df_type} found, using {protocol} from output prefix {ctx.file_access.raw_output_prefix}"
             )
@@ -787,7 +802,7 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         :param updated_metadata: New metadata type, since it might be different from the metadata in the literal.
         :return: dataframe. It could be pandas dataframe or arrow table, etc.
         """
-        protocol = get_protocol(sd.uri)
+        protocol = _get_protocol(sd.uri)
         decoder = self.get_decoder(df_type, protocol, sd.metadata.structured_dataset_type.format)
         result = decoder.decode(ctx, sd, updated_metadata)
         if isinstance(result, types.GeneratorType):
@@ -801,12 +816,9 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         df_type: Type[DF],
         updated_metadata: StructuredDatasetMetadata,
     ) -> typing.Iterator[DF]:
-        protocol = get_protocol(sd.uri)
-        decoder = self.DECODERS[df_type][protocol][sd.metadata.structured_dataset_type.format]
-        result: Union[DF, typing.Iterator[DF]] = decoder.decode(ctx, sd, updated_metadata)
-        if not isinstance(result, types.GeneratorType):
-            raise ValueError(f"Decoder {decoder} didn't return iterator {result} but should have from {sd}")
-        return result
+        protocol = _get_protocol(sd.uri)
+        decoder = self.get_decoder(df_type, protocol, sd.metadata.structured_dataset_type.format)
+        return decoder.decode_batches(ctx, sd, updated_metadata)
 
     def _get_dataset_column_literal_type(self, t: Type) -> type_models.LiteralType:
         if t in get_supported_types():
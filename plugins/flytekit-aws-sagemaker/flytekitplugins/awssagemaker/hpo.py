@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Type, Union
 
 from flyteidl.plugins.sagemaker import hyperparameter_tuning_job_pb2 as _pb2_hpo_job
 from flyteidl.plugins.sagemaker import parameter_ranges_pb2 as _pb2_params
+from flyteidl.plugins.sagemaker import training_job_pb2 as _pb2_training_job
 from flytekitplugins.awssagemaker.training import SagemakerBuiltinAlgorithmsTask, SagemakerCustomTrainingTask
 from google.protobuf import json_format
 from google.protobuf.json_format import MessageToDict
@@ -16,7 +17,6 @@ from flytekit.models.types import LiteralType, SimpleType
 
 from .models import hpo_job as _hpo_job_model
 from .models import parameter_ranges as _params
-from .models import training_job as _training_job_model
 
 
 @dataclass
@@ -60,10 +60,10 @@ class SagemakerHPOTask(PythonTask[HPOJob]):
         self._task_config = task_config
         self._training_task = training_task
 
-        extra_inputs = {"hyperparameter_tuning_job_config": _hpo_job_model.HyperparameterTuningJobConfig}
-
-        if task_config.tunable_params:
-            extra_inputs.update({param: _params.ParameterRangeOneOf for param in task_config.tunable_params})
+        extra_inputs = {
+            "hyperparameter_tuning_job_config": _hpo_job_model.HyperparameterTuningJobConfig,
+            **dict.fromkeys(task_config.tunable_params or (), _params.ParameterRangeOneOf),
+        }
 
         iface = training_task.python_interface
         updated_iface = iface.with_inputs(extra_inputs)
@@ -79,19 +79,78 @@ class SagemakerHPOTask(PythonTask[HPOJob]):
         raise NotImplementedError("Sagemaker HPO Task cannot be executed locally, to execute locally mock it!")
 
     def get_custom(self, settings: SerializationSettings) -> Dict[str, Any]:
-        training_job = _training_job_model.TrainingJob(
-            algorithm_specification=self._training_task.task_config.algorithm_specification,
-            training_job_resource_config=self._training_task.task_config.training_job_resource_config,
-        )
-        return MessageToDict(
-            _hpo_job_model.HyperparameterTuningJob(
+        return _hpo_job_to_dict(
+            _pb2_hpo_job.HyperparameterTuningJob(
                 max_number_of_training_jobs=self.task_config.max_number_of_training_jobs,
                 max_parallel_training_jobs=self.task_config.max_parallel_training_jobs,
-                training_job=training_job,
-            ).to_flyte_idl()
+                training_job=self._training_task._training_job_idl,
+            )
         )
 
 
+# %%
+# The custom of the HPO task has a small, fixed schema, so instead of going through the reflection based
+# ``MessageToDict`` we walk the known fields directly. The output is identical to ``MessageToDict``: camelCase keys,
+# int64 values as strings, enums by name and fields holding their default value left out.
+
+
+def _resource_config_to_dict(msg: _pb2_training_job.TrainingJobResourceConfig) -> Dict[str, Any]:
+    d: Dict[str, Any] = {}
+    if msg.instance_count:
+        d["instanceCount"] = str(msg.instance_count)
+    if msg.instance_type:
+        d["instanceType"] = msg.instance_type
+    if msg.volume_size_in_gb:
+        d["volumeSizeInGb"] = str(msg.volume_size_in_gb)
+    if msg.distributed_protocol:
+        d["distributedProtocol"] = _pb2_training_job.DistributedProtocol.Value.Name(msg.distributed_protocol)
+    return d
+
+
+def _metric_definition_to_dict(msg: _pb2_training_job.MetricDefinition) -> Dict[str, Any]:
+    d: Dict[str, Any] = {}
+    if msg.name:
+        d["name"] = msg.name
+    if msg.regex:
+        d["regex"] = msg.regex
+    return d
+
+
+def _algorithm_specification_to_dict(msg: _pb2_training_job.AlgorithmSpecification) -> Dict[str, Any]:
+    d: Dict[str, Any] = {}
+    if msg.input_mode:
+        d["inputMode"] = _pb2_training_job.InputMode.Value.Name(msg.input_mode)
+    if msg.algorithm_name:
+        d["algorithmName"] = _pb2_training_job.AlgorithmName.Value.Name(msg.algorithm_name)
+    if msg.algorithm_version:
+        d["algorithmVersion"] = msg.algorithm_version
+    if msg.metric_definitions:
+        d["metricDefinitions"] = [_metric_definition_to_dict(m) for m in msg.metric_definitions]
+    if msg.input_content_type:
+        d["inputContentType"] = _pb2_training_job.InputContentType.Value.Name(msg.input_content_type)
+    return d
+
+
+def _training_job_to_dict(msg: _pb2_training_job.TrainingJob) -> Dict[str, Any]:
+    d: Dict[str, Any] = {}
+    if msg.HasField("algorithm_specification"):
+        d["algorithmSpecification"] = _algorithm_specification_to_dict(msg.algorithm_specification)
+    if msg.HasField("training_job_resource_config"):
+        d["trainingJobResourceConfig"] = _resource_config_to_dict(msg.training_job_resource_config)
+    return d
+
+
+def _hpo_job_to_dict(msg: _pb2_hpo_job.HyperparameterTuningJob) -> Dict[str, Any]:
+    d: Dict[str, Any] = {}
+    if msg.HasField("training_job"):
+        d["trainingJob"] = _training_job_to_dict(msg.training_job)
+    if msg.max_number_of_training_jobs:
+        d["maxNumberOfTrainingJobs"] = str(msg.max_number_of_training_jobs)
+    if msg.max_parallel_training_jobs:
+        d["maxParallelTrainingJobs"] = str(msg.max_parallel_training_jobs)
+    return d
+
+
 # %%
 # HPO Task allows ParameterRangeOneOf and HyperparameterTuningJobConfig as inputs. In flytekit this is possible
 # to allow these two types to be registered as valid input / output types and provide a custom transformer
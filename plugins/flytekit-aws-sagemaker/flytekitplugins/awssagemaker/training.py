@@ -1,7 +1,9 @@
 import typing
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, Callable, Dict
 
+from flyteidl.plugins.sagemaker import training_job_pb2 as _training_job_pb2
 from flytekitplugins.awssagemaker.distributed_training import DistributedTrainingContext
 from google.protobuf.json_format import MessageToDict
 from typing_extensions import Annotated
@@ -90,12 +92,18 @@ class SagemakerBuiltinAlgorithmsTask(PythonTask[SagemakerTrainingJobConfig]):
             **kwargs,
         )
 
-    def get_custom(self, settings: SerializationSettings) -> Dict[str, Any]:
-        training_job = _training_job_models.TrainingJob(
+    @cached_property
+    def _training_job_idl(self) -> _training_job_pb2.TrainingJob:
+        """
+        The TrainingJob IDL of this task, shared by the custom of this task and of the HPO tasks built on top of it.
+        """
+        return _training_job_models.TrainingJob(
             algorithm_specification=self._task_config.algorithm_specification,
             training_job_resource_config=self._task_config.training_job_resource_config,
-        )
-        return MessageToDict(training_job.to_flyte_idl())
+        ).to_flyte_idl()
+
+    def get_custom(self, settings: SerializationSettings) -> Dict[str, Any]:
+        return MessageToDict(self._training_job_idl)
 
     def execute(self, **kwargs) -> Any:
         raise NotImplementedError(
@@ -134,12 +142,18 @@ class SagemakerCustomTrainingTask(PythonFunctionTask[SagemakerTrainingJobConfig]
             **kwargs,
         )
 
-    def get_custom(self, settings: SerializationSettings) -> Dict[str, Any]:
-        training_job = _training_job_models.TrainingJob(
+    @cached_property
+    def _training_job_idl(self) -> _training_job_pb2.TrainingJob:
+        """
+        The TrainingJob IDL of this task, shared by the custom of this task and of the HPO tasks built on top of it.
+        """
+        return _training_job_models.TrainingJob(
             algorithm_specification=self.task_config.algorithm_specification,
             training_job_resource_config=self.task_config.training_job_resource_config,
-        )
-        return MessageToDict(training_job.to_flyte_idl())
+        ).to_flyte_idl()
+
+    def get_custom(self, settings: SerializationSettings) -> Dict[str, Any]:
+        return MessageToDict(self._training_job_idl)
 
     def _is_distributed(self) -> bool:
         """
@@ -1,16 +1,24 @@
-import argparse
+from __future__ import annotations
+
 import logging
 import os
-import subprocess
 import sys
 
-from natsort import natsorted
-
 FLYTE_ARG_PREFIX = "--__FLYTE"
 FLYTE_ENV_VAR_PREFIX = f"{FLYTE_ARG_PREFIX}_ENV_VAR_"
 FLYTE_CMD_PREFIX = f"{FLYTE_ARG_PREFIX}_CMD_"
 FLYTE_ARG_SUFFIX = "__"
 
+logger = logging.getLogger(__name__)
+
+_ARG_PREFIX_LEN = len(FLYTE_ARG_PREFIX)
+_ENV_VAR_PREFIX_LEN = len(FLYTE_ENV_VAR_PREFIX)
+_CMD_PREFIX_LEN = len(FLYTE_CMD_PREFIX)
+_ARG_SUFFIX_LEN = len(FLYTE_ARG_SUFFIX)
+# What follows FLYTE_ARG_PREFIX in the cmd and env var arguments, i.e. `_ENV_VAR_` and `_CMD_`
+_ENV_VAR_MARKER = FLYTE_ENV_VAR_PREFIX[_ARG_PREFIX_LEN:]
+_CMD_MARKER = FLYTE_CMD_PREFIX[_ARG_PREFIX_LEN:]
+
 
 # This script is the "entrypoint" script for SageMaker. An environment variable must be set on the container (typically
 # in the Dockerfile) of SAGEMAKER_PROGRAM=flytekit_sagemaker_runner.py. When the container is launched in SageMaker,
@@ -32,63 +40,59 @@ FLYTE_ARG_SUFFIX = "__"
 # --__FLYTE_CMD_9_s3://fake-bucket__ __FLYTE_CMD_DUMMY_VALUE__
 
 
-def parse_args(cli_args):
-    parser = argparse.ArgumentParser(description="Running sagemaker task")
-    args, unknowns = parser.parse_known_args(cli_args)
+def parse_args(cli_args: list[str]) -> tuple[list[str], dict[str, str]]:
+    # This runs on every container start, so the arguments are scanned directly rather than going through argparse,
+    # which doesn't know any of them anyway and is comparatively slow to import.
+    unknowns = cli_args
 
-    # Parse the command line and env vars
-    flyte_cmd = []
-    env_vars = {}
-    i = 0
+    # Parse the command line and env vars. The cmd is collected by its index, which is dense (0..n-1)
+    flyte_cmd: dict[int, str] = {}
+    env_vars: dict[str, str] = {}
+    i: int = 0
 
     while i < len(unknowns):
         unknown = unknowns[i]
-        logging.info(f"Processing argument {unknown}")
-        if unknown.startswith(FLYTE_CMD_PREFIX) and unknown.endswith(FLYTE_ARG_SUFFIX):
-            processed = unknown[len(FLYTE_CMD_PREFIX) :][: -len(FLYTE_ARG_SUFFIX)]
+        i += 1
+        logger.debug("Processing argument %s", unknown)
+        # To prevent SageMaker from ignoring our __FLYTE_CMD_*__ hyperparameters, we need to set a dummy value
+        # which serves as a placeholder for each of them. The dummy value placeholder `__FLYTE_CMD_DUMMY_VALUE__`
+        # doesn't start with the common prefix and will be ignored
+        if not unknown.startswith(FLYTE_ARG_PREFIX) or not unknown.endswith(FLYTE_ARG_SUFFIX):
+            continue
+        # Both kinds of arguments share FLYTE_ARG_PREFIX, only look at what comes after it
+        if unknown.startswith(_CMD_MARKER, _ARG_PREFIX_LEN):
             # Parse the format `1_--task-module`
-            parts = processed.split("_", maxsplit=1)
-            flyte_cmd.append((parts[0], parts[1]))
-            i += 1
-        elif unknown.startswith(FLYTE_ENV_VAR_PREFIX) and unknown.endswith(FLYTE_ARG_SUFFIX):
-            processed = unknown[len(FLYTE_ENV_VAR_PREFIX) :][: -len(FLYTE_ARG_SUFFIX)]
-            i += 1
-            if unknowns[i].startswith(FLYTE_ARG_PREFIX) is False:
-                env_vars[processed] = unknowns[i]
+            index, _, value = unknown[_CMD_PREFIX_LEN:-_ARG_SUFFIX_LEN].partition("_")
+            flyte_cmd[int(index)] = value
+        elif unknown.startswith(_ENV_VAR_MARKER, _ARG_PREFIX_LEN):
+            if i < len(unknowns) and not unknowns[i].startswith(FLYTE_ARG_PREFIX):
+                env_vars[unknown[_ENV_VAR_PREFIX_LEN:-_ARG_SUFFIX_LEN]] = unknowns[i]
                 i += 1
-        else:
-            # To prevent SageMaker from ignoring our __FLYTE_CMD_*__ hyperparameters, we need to set a dummy value
-            # which serves as a placeholder for each of them. The dummy value placeholder `__FLYTE_CMD_DUMMY_VALUE__`
-            # falls into this branch and will be ignored
-            i += 1
-
-    return flyte_cmd, env_vars
-
-
-def sort_flyte_cmd(flyte_cmd):
-    # Order the cmd using the index (the first element in each tuple)
-    flyte_cmd = natsorted(flyte_cmd, key=lambda x: x[0])
-    flyte_cmd = [x[1] for x in flyte_cmd]
-    return flyte_cmd
-
 
-def set_env_vars(env_vars):
-    for key, val in env_vars.items():
-        os.environ[key] = val
+    try:
+        return [flyte_cmd[index] for index in range(len(flyte_cmd))], env_vars
+    except KeyError as e:
+        raise ValueError(f"Missing argument {e} in the flyte command, got indices {sorted(flyte_cmd)}") from e
 
 
-def run(cli_args):
+def run(cli_args: list[str]):
     flyte_cmd, env_vars = parse_args(cli_args)
-    flyte_cmd = sort_flyte_cmd(flyte_cmd)
-    set_env_vars(env_vars)
+    if not flyte_cmd:
+        logger.error("No flyte command found in the arguments")
+        sys.exit(1)
 
-    logging.info(f"Cmd:{flyte_cmd}")
-    logging.info(f"Env vars:{env_vars}")
+    logger.info("Cmd:%s", flyte_cmd)
+    logger.info("Env vars:%s", env_vars)
 
-    # Launching a subprocess with the selected entrypoint script and the rest of the arguments
-    logging.info(f"Launching command: {flyte_cmd}")
-    subprocess.run(flyte_cmd, stdout=sys.stdout, stderr=sys.stderr, encoding="utf-8", check=True)
+    # Replace this process with the selected entrypoint script and the rest of the arguments. There is no need to
+    # keep this interpreter around waiting on a child, and the exit code of the command becomes the one of the
+    # container. Buffered output would be lost by exec, so flush it first.
+    logger.info("Launching command: %s", flyte_cmd)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvpe(flyte_cmd[0], flyte_cmd, {**os.environ, **env_vars})
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     run(sys.argv)
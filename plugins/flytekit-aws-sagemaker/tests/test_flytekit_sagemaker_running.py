@@ -1,7 +1,7 @@
 import os
-import sys
 from unittest import mock
 
+import pytest
 from scripts.flytekit_sagemaker_runner import run as _flyte_sagemaker_run
 
 cmd = []
@@ -19,19 +19,27 @@ cmd.extend(["--__FLYTE_CMD_8_--inputs__", "__FLYTE_CMD_DUMMY_VALUE__"])
 cmd.extend(["--__FLYTE_CMD_9_s3://fake-bucket__", "__FLYTE_CMD_DUMMY_VALUE__"])
 
 
-@mock.patch.dict("os.environ")
-@mock.patch("subprocess.run")
-def test(mock_subprocess_run):
+@mock.patch.dict("os.environ", {"existing": "value"})
+@mock.patch("os.execvpe")
+def test(mock_execvpe):
     _flyte_sagemaker_run(cmd)
-    assert "env1" in os.environ
-    assert "env2" in os.environ
-    assert os.environ["env1"] == "val1"
-    assert os.environ["env2"] == "val2"
-    mock_subprocess_run.assert_called_with(
+    expected_cmd = (
         "service_venv pyflyte-execute --task-module blah --task-name bloh "
-        "--output-prefix s3://fake-bucket --inputs s3://fake-bucket".split(),
-        stdout=sys.stdout,
-        stderr=sys.stderr,
-        encoding="utf-8",
-        check=True,
+        "--output-prefix s3://fake-bucket --inputs s3://fake-bucket".split()
     )
+    mock_execvpe.assert_called_once()
+    file, args, env = mock_execvpe.call_args[0]
+    assert file == "service_venv"
+    assert args == expected_cmd
+    assert env["env1"] == "val1"
+    assert env["env2"] == "val2"
+    assert env["existing"] == "value"
+    # The env vars are only passed to the command
+    assert "env1" not in os.environ
+
+
+@mock.patch("os.execvpe")
+def test_no_cmd(mock_execvpe):
+    with pytest.raises(SystemExit):
+        _flyte_sagemaker_run(["--__FLYTE_ENV_VAR_env1__", "val1"])
+    mock_execvpe.assert_not_called()
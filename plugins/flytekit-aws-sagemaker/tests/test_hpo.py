@@ -8,8 +8,10 @@ from flytekitplugins.awssagemaker.hpo import (
     HPOTuningJobConfigTransformer,
     ParameterRangesTransformer,
     SagemakerHPOTask,
+    _hpo_job_to_dict,
 )
 from flytekitplugins.awssagemaker.models.hpo_job import (
+    HyperparameterTuningJob,
     HyperparameterTuningJobConfig,
     HyperparameterTuningObjective,
     HyperparameterTuningObjectiveType,
@@ -19,9 +21,14 @@ from flytekitplugins.awssagemaker.models.parameter_ranges import IntegerParamete
 from flytekitplugins.awssagemaker.models.training_job import (
     AlgorithmName,
     AlgorithmSpecification,
+    DistributedProtocol,
+    InputMode,
+    MetricDefinition,
+    TrainingJob,
     TrainingJobResourceConfig,
 )
 from flytekitplugins.awssagemaker.training import SagemakerBuiltinAlgorithmsTask, SagemakerTrainingJobConfig
+from google.protobuf.json_format import MessageToDict
 
 from flytekit import FlyteContext
 from flytekit.models.types import LiteralType, SimpleType
@@ -91,6 +98,35 @@ def test_hpo_for_builtin():
             )
 
 
+def test_hpo_job_to_dict():
+    hpo_job = HyperparameterTuningJob(
+        max_number_of_training_jobs=10,
+        max_parallel_training_jobs=2,
+        training_job=TrainingJob(
+            algorithm_specification=AlgorithmSpecification(
+                algorithm_name=AlgorithmName.CUSTOM,
+                algorithm_version="1.0",
+                input_mode=InputMode.PIPE,
+                metric_definitions=[MetricDefinition(name="validation:error", regex="error: (.*)")],
+            ),
+            training_job_resource_config=TrainingJobResourceConfig(
+                instance_count=2,
+                instance_type="ml-xlarge",
+                volume_size_in_gb=25,
+                distributed_protocol=DistributedProtocol.MPI,
+            ),
+        ),
+    ).to_flyte_idl()
+    assert _hpo_job_to_dict(hpo_job) == MessageToDict(hpo_job)
+
+    empty = HyperparameterTuningJob(
+        max_number_of_training_jobs=0,
+        max_parallel_training_jobs=0,
+        training_job=TrainingJob(algorithm_specification=None, training_job_resource_config=None),
+    ).to_flyte_idl()
+    assert _hpo_job_to_dict(empty) == MessageToDict(empty)
+
+
 def test_hpoconfig_transformer():
     t = HPOTuningJobConfigTransformer()
     assert t.get_literal_type(HyperparameterTuningJobConfig) == LiteralType(simple=SimpleType.STRUCT)
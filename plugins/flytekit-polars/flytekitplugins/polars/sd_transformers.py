@@ -1,9 +1,13 @@
+import os
 import typing
 
 import pandas as pd
 import polars as pl
+import pyarrow.dataset as ds
+from botocore.exceptions import NoCredentialsError
+from fsspec.core import split_protocol
 
-from flytekit import FlyteContext
+from flytekit import FlyteContext, logger
 from flytekit.models import literals
 from flytekit.models.literals import StructuredDatasetMetadata
 from flytekit.models.types import StructuredDatasetType
@@ -16,6 +20,17 @@ from flytekit.types.structured.structured_dataset import (
     StructuredDatasetTransformerEngine,
 )
 
+# Raised by sink_parquet for query plans the streaming engine can't run yet. Depending on the polars release this is a
+# regular error or a rust panic. The panic is a pyo3_runtime.PanicException, which doesn't derive from Exception and is
+# not exported by every release, so it is recognized by name.
+_SINK_UNSUPPORTED_ERRORS = tuple(
+    getattr(pl.exceptions, name) for name in ("ComputeError", "InvalidOperationError") if hasattr(pl.exceptions, name)
+)
+
+
+def _is_sink_unsupported_error(e: BaseException) -> bool:
+    return isinstance(e, _SINK_UNSUPPORTED_ERRORS) or type(e).__name__ == "PanicException"
+
 
 class PolarsDataFrameRenderer:
     """
@@ -71,6 +86,76 @@ class ParquetToPolarsDataFrameDecodingHandler(StructuredDatasetDecoder):
         return pl.read_parquet(uri, use_pyarrow=True, storage_options=kwargs)
 
 
+class PolarsLazyFrameToParquetEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pl.LazyFrame, None, PARQUET)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        lf = typing.cast(pl.LazyFrame, structured_dataset.dataframe)
+
+        local_dir = ctx.file_access.get_random_local_directory()
+        local_path = f"{local_dir}/00000"
+
+        # Stream the query plan straight to parquet so the full frame is never materialized in memory.
+        # Older polars releases without sink_parquet, and plans the streaming engine can't run yet, are collected first.
+        if hasattr(lf, "sink_parquet"):
+            try:
+                lf.sink_parquet(local_path, compression="zstd")
+            except BaseException as e:
+                if not _is_sink_unsupported_error(e):
+                    raise
+                logger.debug(f"Cannot stream the polars query plan to parquet, collecting it instead: {e}")
+                lf.collect().write_parquet(local_path, compression="zstd")
+        else:
+            lf.collect().write_parquet(local_path, compression="zstd")
+        remote_dir = typing.cast(str, structured_dataset.uri) or ctx.file_access.get_random_remote_directory()
+        ctx.file_access.upload_directory(local_dir, remote_dir)
+        return literals.StructuredDataset(uri=remote_dir, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ParquetToPolarsLazyFrameDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pl.LazyFrame, None, PARQUET)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pl.LazyFrame:
+        uri = flyte_value.uri
+        _, path = split_protocol(uri)
+        if ctx.file_access.is_remote(uri):
+            # The storage options flytekit builds are meant for fsspec, which polars' own cloud reader doesn't
+            # understand, so scan a pyarrow dataset on the filesystem flytekit uses for the uri instead.
+            try:
+                fs = ctx.file_access.get_filesystem_for_path(uri)
+                dataset = ds.dataset(path, filesystem=fs, format="parquet")
+            except NoCredentialsError as e:
+                logger.debug("S3 source detected, attempting anonymous S3 access")
+                fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=True)
+                if fs is None:
+                    raise e
+                dataset = ds.dataset(path, filesystem=fs, format="parquet")
+            lf = pl.scan_pyarrow_dataset(dataset) if hasattr(pl, "scan_pyarrow_dataset") else pl.scan_ds(dataset)
+        else:
+            # Structured datasets written by flytekit are directories of parquet files.
+            if os.path.isdir(path):
+                path = f"{path.rstrip('/')}/*"
+            lf = pl.scan_parquet(path)
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+            return lf.select(columns)
+        return lf
+
+
 StructuredDatasetTransformerEngine.register(PolarsDataFrameToParquetEncodingHandler())
 StructuredDatasetTransformerEngine.register(ParquetToPolarsDataFrameDecodingHandler())
+StructuredDatasetTransformerEngine.register(PolarsLazyFrameToParquetEncodingHandler())
+StructuredDatasetTransformerEngine.register(ParquetToPolarsLazyFrameDecodingHandler())
 StructuredDatasetTransformerEngine.register_renderer(pl.DataFrame, PolarsDataFrameRenderer())
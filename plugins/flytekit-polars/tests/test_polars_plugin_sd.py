@@ -63,6 +63,55 @@ def test_polars_workflow_full():
     assert result is not None
 
 
+def test_polars_lazyframe_workflow():
+    @task
+    def generate() -> subset_schema:
+        lf = pl.DataFrame({"col1": [1, 3, 2], "col2": list("abc")}).lazy()
+        return StructuredDataset(dataframe=lf.filter(pl.col("col1") > 1))
+
+    @task
+    def consume(df: subset_schema) -> pl.LazyFrame:
+        lf = df.open(pl.LazyFrame).all()
+        assert isinstance(lf, pl.LazyFrame)
+        return lf
+
+    @workflow
+    def wf() -> pl.LazyFrame:
+        return consume(df=generate())
+
+    result = wf().collect()
+    assert result.columns == ["col2"]
+    assert sorted(result["col2"].to_list()) == ["b", "c"]
+
+
+def test_polars_lazyframe_not_streamable(monkeypatch):
+    @task
+    def generate() -> full_schema:
+        lf = pl.DataFrame({"col1": [1, 3, 2], "col2": list("abc")}).lazy()
+        # Python UDFs can't run in the streaming engine
+        udf = lf.map_batches if hasattr(lf, "map_batches") else lf.map
+        return StructuredDataset(dataframe=udf(lambda df: df.sort("col1")))
+
+    @task
+    def consume(df: full_schema) -> pl.DataFrame:
+        return df.open(pl.LazyFrame).all().collect()
+
+    @workflow
+    def wf() -> pl.DataFrame:
+        return consume(df=generate())
+
+    expected = pl.DataFrame({"col1": [1, 2, 3], "col2": list("acb")})
+    assert wf().frame_equal(expected)
+
+    def sink_parquet(*args, **kwargs):
+        raise pl.exceptions.ComputeError(
+            "sink_parquet not yet supported in standard engine. Use 'collect().write_parquet()'"
+        )
+
+    monkeypatch.setattr(pl.LazyFrame, "sink_parquet", sink_parquet)
+    assert wf().frame_equal(expected)
+
+
 def test_polars_renderer():
     df = pl.DataFrame({"col1": [1, 3, 2], "col2": list("abc")})
     assert PolarsDataFrameRenderer().to_html(df) == pd.DataFrame(
@@ -25,6 +25,7 @@ from flytekit.types.structured.structured_dataset import (
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
     StructuredDatasetTransformerEngine,
+    _get_protocol,
     convert_schema_type_to_structured_dataset_type,
     extract_cols_and_format,
 )
@@ -49,6 +50,14 @@ def test_protocol():
     assert get_protocol("/file") == "file"
 
 
+@pytest.mark.parametrize(
+    "uri",
+    ["s3://my-s3-bucket/file", "/file", "file:///tmp/x", "gs://b/a::b", "simplecache::s3://bucket/x", "bq://p:d.t", ""],
+)
+def test_get_protocol_matches_fsspec(uri):
+    assert _get_protocol(uri) == get_protocol(uri)
+
+
 def generate_pandas() -> pd.DataFrame:
     return pd.DataFrame({"name": ["Tom", "Joseph"], "age": [20, 22]})
 
@@ -74,6 +83,31 @@ def test_formats_make_sense():
         assert val.metadata.structured_dataset_type.format == "parquet"
 
 
+def test_arrow_format():
+    @task
+    def t1() -> Annotated[pd.DataFrame, "arrow"]:
+        return generate_pandas()
+
+    @task
+    def t2(a: pd.DataFrame) -> int:
+        return len(a)
+
+    @workflow
+    def wf() -> int:
+        return t2(a=t1())
+
+    ctx = FlyteContextManager.current_context()
+    with FlyteContextManager.with_context(
+        ctx.with_execution_state(
+            ctx.new_execution_state().with_params(mode=ExecutionState.Mode.LOCAL_WORKFLOW_EXECUTION)
+        )
+    ):
+        result = t1()
+        assert result.val.scalar.value.metadata.structured_dataset_type.format == "arrow"
+
+    assert wf() == 2
+
+
 def test_setting_of_unset_formats():
     custom = Annotated[StructuredDataset, "parquet"]
     example = custom(dataframe=df, uri="/path")
@@ -285,7 +319,7 @@ def test_slash_register():
     StructuredDatasetTransformerEngine.register(TempEncoder("/"))
     res = StructuredDatasetTransformerEngine.get_encoder(MyDF, "file", "/")
     # Test that the one we got was registered under fsspec
-    assert res is StructuredDatasetTransformerEngine.ENCODERS[MyDF].get("fsspec")["/"]
+    assert res is StructuredDatasetTransformerEngine.ENCODERS[(MyDF, "fsspec", "/")]
     assert res is not None
 
 
@@ -2,12 +2,13 @@ import typing
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
 from flytekit.core import context_manager
 from flytekit.core.base_task import kwtypes
 from flytekit.models.literals import StructuredDatasetMetadata
-from flytekit.models.types import StructuredDatasetType
+from flytekit.models.types import LiteralType, SimpleType, StructuredDatasetType
 from flytekit.types.structured import basic_dfs
 from flytekit.types.structured.structured_dataset import (
     StructuredDataset,
@@ -36,6 +37,130 @@ def test_pandas():
     assert df.equals(df2)
 
 
+def test_use_dictionary_encoding():
+    df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
+    assert basic_dfs.use_dictionary_encoding(pa.Table.from_pandas(df)) is True
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [1, 2], "c": [True, False]})
+    assert basic_dfs.use_dictionary_encoding(pa.Table.from_pandas(df)) == ["b", "c"]
+    df = pd.DataFrame({"a": [1.0, 2.0]}, index=pd.Index(["x", "y"], name="key"))
+    assert basic_dfs.use_dictionary_encoding(pa.Table.from_pandas(df)) == ["key"]
+
+    flat = pa.array([0.1, 0.2, 0.3, 0.4], type=pa.float32())
+    embeddings = pa.FixedSizeListArray.from_arrays(flat, 2)
+    assert basic_dfs.use_dictionary_encoding(pa.table({"id": [1, 2], "embedding": embeddings})) == ["id"]
+    assert basic_dfs.use_dictionary_encoding(pa.table({"id": [1, 2], "name": ["a", "b"]})) is True
+    tags = pa.array([["a"], ["b"]])
+    assert basic_dfs.use_dictionary_encoding(pa.table({"tags": tags, "embedding": embeddings})) is True
+
+
+def test_pandas_numeric():
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [1, 2]})
+    encoder = basic_dfs.PandasToParquetEncodingHandler()
+    decoder = basic_dfs.ParquetToPandasDecodingHandler()
+
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd = StructuredDataset(dataframe=df)
+    sd_type = StructuredDatasetType(format="parquet")
+    sd_lit = encoder.encode(ctx, sd, sd_type)
+
+    row_group = pq.ParquetFile(f"{sd_lit.uri}/00000").metadata.row_group(0)
+    assert "RLE_DICTIONARY" not in row_group.column(0).encodings
+    assert "RLE_DICTIONARY" in row_group.column(1).encodings
+
+    df2 = decoder.decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
+    assert df.equals(df2)
+
+
+def test_pandas_index_with_column_subset():
+    df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]}, index=pd.Index(["a", "b"], name="key"))
+    encoder = basic_dfs.PandasToParquetEncodingHandler()
+    decoder = basic_dfs.ParquetToPandasDecodingHandler()
+
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd = StructuredDataset(dataframe=df)
+    sd_lit = encoder.encode(ctx, sd, StructuredDatasetType(format="parquet"))
+
+    age_type = StructuredDatasetType(
+        columns=[StructuredDatasetType.DatasetColumn(name="Age", literal_type=LiteralType(simple=SimpleType.INTEGER))],
+        format="parquet",
+    )
+    df2 = decoder.decode(ctx, sd_lit, StructuredDatasetMetadata(age_type))
+    assert df[["Age"]].equals(df2)
+    assert list(df2.index) == ["a", "b"]
+    assert df2.index.name == "key"
+
+    batches = list(decoder.decode_batches(ctx, sd_lit, StructuredDatasetMetadata(age_type)))
+    assert df[["Age"]].equals(pd.concat(batches))
+
+
+def test_pandas_decode_batches(monkeypatch):
+    monkeypatch.setattr(basic_dfs, "PARQUET_BATCH_SIZE", 2)
+    df = pd.DataFrame({"Name": ["Tom", "Joseph", "Jane", "Ann", "Bob"], "Age": [20, 22, 24, 26, 28]})
+    encoder = basic_dfs.PandasToParquetEncodingHandler()
+    decoder = basic_dfs.ParquetToPandasDecodingHandler()
+
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd = StructuredDataset(dataframe=df)
+    sd_type = StructuredDatasetType(format="parquet")
+    sd_lit = encoder.encode(ctx, sd, sd_type)
+
+    batches = list(decoder.decode_batches(ctx, sd_lit, StructuredDatasetMetadata(sd_type)))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert df.equals(pd.concat(batches, ignore_index=True))
+
+    age_type = StructuredDatasetType(
+        columns=[StructuredDatasetType.DatasetColumn(name="Age", literal_type=LiteralType(simple=SimpleType.INTEGER))],
+        format="parquet",
+    )
+    batches = list(decoder.decode_batches(ctx, sd_lit, StructuredDatasetMetadata(age_type)))
+    assert all(list(b.columns) == ["Age"] for b in batches)
+
+    arrow_decoder = basic_dfs.ParquetToArrowDecodingHandler()
+    tables = list(arrow_decoder.decode_batches(ctx, sd_lit, StructuredDatasetMetadata(sd_type)))
+    assert sum(t.num_rows for t in tables) == 5
+
+
+def test_arrow_ipc():
+    df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
+    encoder = basic_dfs.PandasToArrowIPCEncodingHandler()
+    decoder = basic_dfs.ArrowIPCToPandasDecodingHandler()
+
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd = StructuredDataset(dataframe=df)
+    sd_type = StructuredDatasetType(format="arrow")
+    sd_lit = encoder.encode(ctx, sd, sd_type)
+    assert sd_lit.metadata.structured_dataset_type.format == "arrow"
+
+    df2 = decoder.decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
+    assert df.equals(df2)
+
+    age_type = StructuredDatasetType(
+        columns=[StructuredDatasetType.DatasetColumn(name="Age", literal_type=LiteralType(simple=SimpleType.INTEGER))],
+        format="arrow",
+    )
+    table = basic_dfs.ArrowIPCToArrowDecodingHandler().decode(ctx, sd_lit, StructuredDatasetMetadata(age_type))
+    assert table.column_names == ["Age"]
+    assert table.column("Age").to_pylist() == [20, 22]
+
+
+def test_arrow_ipc_index_with_column_subset():
+    df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]}, index=pd.Index(["a", "b"], name="key"))
+    encoder = basic_dfs.PandasToArrowIPCEncodingHandler()
+    decoder = basic_dfs.ArrowIPCToPandasDecodingHandler()
+
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd = StructuredDataset(dataframe=df)
+    sd_lit = encoder.encode(ctx, sd, StructuredDatasetType(format="arrow"))
+
+    age_type = StructuredDatasetType(
+        columns=[StructuredDatasetType.DatasetColumn(name="Age", literal_type=LiteralType(simple=SimpleType.INTEGER))],
+        format="arrow",
+    )
+    df2 = decoder.decode(ctx, sd_lit, StructuredDatasetMetadata(age_type))
+    assert df[["Age"]].equals(df2)
+    assert df2.index.name == "key"
+
+
 def test_csv():
     df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
     encoder = basic_dfs.PandasToCSVEncodingHandler()
@@ -64,5 +189,5 @@ def test_arrow():
     assert encoder.protocol is None
     assert decoder.protocol is None
     assert encoder.python_type is decoder.python_type
-    d = StructuredDatasetTransformerEngine.DECODERS[encoder.python_type]["fsspec"]["parquet"]
+    d = StructuredDatasetTransformerEngine.DECODERS[(encoder.python_type, "fsspec", "parquet")]
     assert d is not None
@@ -3,7 +3,7 @@ from itertools import product
 
 import pytest
 from flyteidl.core.tasks_pb2 import TaskMetadata
-from google.protobuf import text_format
+from google.protobuf import json_format, struct_pb2, text_format
 
 import flytekit.models.interface as interface_models
 import flytekit.models.literals as literal_models
@@ -126,6 +126,20 @@ def test_task_template(in_tuple):
     assert obj.config == {"a": "b"}
 
 
+@pytest.mark.parametrize(
+    "custom",
+    [
+        {"a": 1, "b": {"c": 2.5, "d": [1, "x", None, True]}, "e": "", "f": {}},
+        {"trainingJob": {"algorithmSpecification": {"algorithmName": "XGBOOST"}}, "maxNumberOfTrainingJobs": "10"},
+        {"a": {1: "int key"}, "b": (1, 2)},
+    ],
+)
+def test_custom_to_struct(custom):
+    import json
+
+    assert task._custom_to_struct(custom) == json_format.Parse(json.dumps(custom), struct_pb2.Struct())
+
+
 def test_task_spec():
     task_metadata = task.TaskMetadata(
         True,
@@ -0,0 +1,99 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from typing_extensions import Annotated
+
+from flytekit import StructuredDataset, kwtypes, task, workflow
+
+flight = pytest.importorskip("pyarrow.flight")
+
+from flytekit.types.structured import StructuredDatasetTransformerEngine, register_flight_handlers  # noqa: E402
+
+pd_df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
+my_cols = kwtypes(Name=str, Age=int)
+
+
+class InMemoryFlightServer(flight.FlightServerBase):
+    def __init__(self):
+        super().__init__("grpc://127.0.0.1:0")
+        self.tables = {}
+
+    def do_put(self, context, descriptor, reader, writer):
+        self.tables[descriptor.path[0]] = reader.read_all()
+
+    def get_flight_info(self, context, descriptor):
+        table = self.tables[descriptor.path[0]]
+        endpoints = [flight.FlightEndpoint(descriptor.path[0], [])] if table.num_rows else []
+        return flight.FlightInfo(table.schema, descriptor, endpoints, table.num_rows, -1)
+
+    def do_get(self, context, ticket):
+        return flight.RecordBatchStream(self.tables[ticket.ticket])
+
+
+class RedirectingFlightServer(flight.FlightServerBase):
+    """
+    Only serves flight info, pointing clients to the data server for the data itself.
+    """
+
+    def __init__(self, data_server: InMemoryFlightServer):
+        super().__init__("grpc://127.0.0.1:0")
+        self.data_server = data_server
+
+    def get_flight_info(self, context, descriptor):
+        table = self.data_server.tables[descriptor.path[0]]
+        location = flight.Location.for_grpc_tcp("127.0.0.1", self.data_server.port)
+        endpoint = flight.FlightEndpoint(descriptor.path[0], [location])
+        return flight.FlightInfo(table.schema, descriptor, [endpoint], table.num_rows, -1)
+
+
+@pytest.fixture
+def flight_server():
+    if (pd.DataFrame, "grpc", "") not in StructuredDatasetTransformerEngine.ENCODERS:
+        register_flight_handlers()
+    with InMemoryFlightServer() as server:
+        yield server
+
+
+def test_flight_wf(flight_server):
+    uri = f"grpc://127.0.0.1:{flight_server.port}/flyte/table"
+
+    @task
+    def t1() -> Annotated[StructuredDataset, my_cols]:
+        return StructuredDataset(dataframe=pd_df, uri=uri)
+
+    @task
+    def t2(sd: Annotated[StructuredDataset, kwtypes(Age=int)]) -> pa.Table:
+        return sd.open(pa.Table).all()
+
+    @workflow
+    def wf() -> pa.Table:
+        return t2(sd=t1())
+
+    table = wf()
+    assert table.column_names == ["Age"]
+    assert table.column("Age").to_pylist() == [20, 22]
+    assert flight_server.tables[b"flyte/table"].to_pandas().equals(pd_df)
+
+
+def test_flight_endpoint_locations(flight_server):
+    flight_server.tables[b"flyte/table"] = pa.Table.from_pandas(pd_df)
+
+    @task
+    def t1(sd: StructuredDataset) -> pd.DataFrame:
+        return sd.open(pd.DataFrame).all()
+
+    with RedirectingFlightServer(flight_server) as redirecting_server:
+        df = t1(sd=StructuredDataset(uri=f"grpc://127.0.0.1:{redirecting_server.port}/flyte/table"))
+    assert df.equals(pd_df)
+
+
+def test_flight_no_endpoints(flight_server):
+    flight_server.tables[b"flyte/empty"] = pa.Table.from_pandas(pd_df.iloc[:0], preserve_index=False)
+
+    @task
+    def t1(sd: StructuredDataset) -> pa.Table:
+        return sd.open(pa.Table).all()
+
+    table = t1(sd=StructuredDataset(uri=f"grpc://127.0.0.1:{flight_server.port}/flyte/empty"))
+    assert table.num_rows == 0
+    assert table.column_names == ["Name", "Age"]